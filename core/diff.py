@@ -0,0 +1,222 @@
+"""Structural diff and in-place patching of Circuit graphs.
+
+A CircuitDiff records what changed between two circuits: components added,
+removed or redefined, nets added or removed, and pins that moved between
+nets. Applying it to the old circuit touches only the changed entries.
+"""
+import copy
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from core.models import Circuit, Component, Net
+
+
+@dataclass
+class PinMove:
+    pin_id: str
+    old_net: Optional[str]
+    new_net: Optional[str]
+
+    def to_dict(self):
+        return {"pin_id": self.pin_id, "old_net": self.old_net, "new_net": self.new_net}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(pin_id=data["pin_id"], old_net=data.get("old_net"), new_net=data.get("new_net"))
+
+
+@dataclass
+class CircuitDiff:
+    added_components: Dict[str, Component] = field(default_factory=dict)
+    removed_components: List[str] = field(default_factory=list)
+    changed_components: Dict[str, Component] = field(default_factory=dict)
+    added_nets: List[str] = field(default_factory=list)
+    removed_nets: List[str] = field(default_factory=list)
+    pin_moves: List[PinMove] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_components
+            or self.removed_components
+            or self.changed_components
+            or self.added_nets
+            or self.removed_nets
+            or self.pin_moves
+        )
+
+    def touched_components(self) -> Set[str]:
+        """Ids of components that exist after the patch and were affected by it."""
+        touched = set(self.added_components) | set(self.changed_components)
+        for move in self.pin_moves:
+            touched.add(move.pin_id.split(".", 1)[0])
+        return touched - set(self.removed_components)
+
+    def touched_nets(self) -> Set[str]:
+        """Ids of nets that exist after the patch and were affected by it."""
+        touched = set(self.added_nets)
+        for move in self.pin_moves:
+            if move.old_net is not None:
+                touched.add(move.old_net)
+            if move.new_net is not None:
+                touched.add(move.new_net)
+        return touched - set(self.removed_nets)
+
+    def to_dict(self):
+        return {
+            "added_components": {k: v.to_dict() for k, v in self.added_components.items()},
+            "removed_components": list(self.removed_components),
+            "changed_components": {k: v.to_dict() for k, v in self.changed_components.items()},
+            "added_nets": list(self.added_nets),
+            "removed_nets": list(self.removed_nets),
+            "pin_moves": [m.to_dict() for m in self.pin_moves],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            added_components={k: Component.from_dict(v) for k, v in data.get("added_components", {}).items()},
+            removed_components=list(data.get("removed_components", [])),
+            changed_components={k: Component.from_dict(v) for k, v in data.get("changed_components", {}).items()},
+            added_nets=list(data.get("added_nets", [])),
+            removed_nets=list(data.get("removed_nets", [])),
+            pin_moves=[PinMove.from_dict(m) for m in data.get("pin_moves", [])],
+        )
+
+
+def _pin_net_map(circuit: Circuit) -> Dict[str, str]:
+    # nets are the source of truth for connectivity (builder keeps pin.net in sync)
+    pin_nets = {}
+    for net in circuit.nets.values():
+        for pin_id in net.pins:
+            pin_nets[pin_id] = net.id
+    return pin_nets
+
+
+def _component_signature(comp: Component):
+    # everything that defines a component except its connectivity
+    pins = tuple(
+        (name, pin.id, pin.direction, pin.role) for name, pin in sorted(comp.pins.items())
+    )
+    return (comp.type, comp.value, pins)
+
+
+def diff_circuits(old: Circuit, new: Circuit) -> CircuitDiff:
+    diff = CircuitDiff()
+
+    for cid, comp in new.components.items():
+        if cid not in old.components:
+            diff.added_components[cid] = copy.deepcopy(comp)
+        elif _component_signature(old.components[cid]) != _component_signature(comp):
+            diff.changed_components[cid] = copy.deepcopy(comp)
+
+    diff.removed_components = [cid for cid in old.components if cid not in new.components]
+    diff.added_nets = [nid for nid in new.nets if nid not in old.nets]
+    diff.removed_nets = [nid for nid in old.nets if nid not in new.nets]
+
+    old_pins = _pin_net_map(old)
+    new_pins = _pin_net_map(new)
+    for pin_id in list(old_pins) + [p for p in new_pins if p not in old_pins]:
+        old_net = old_pins.get(pin_id)
+        new_net = new_pins.get(pin_id)
+        if old_net != new_net:
+            diff.pin_moves.append(PinMove(pin_id=pin_id, old_net=old_net, new_net=new_net))
+
+    return diff
+
+
+def _check_diff(circuit: Circuit, diff: CircuitDiff):
+    # Every precondition is checked up front so a bad diff never leaves the circuit half-patched
+    for cid in diff.removed_components:
+        if cid not in circuit.components:
+            raise KeyError(f"Component {cid} not found in circuit")
+
+    for cid in diff.changed_components:
+        if cid not in circuit.components or cid in diff.removed_components:
+            raise KeyError(f"Component {cid} not found in circuit")
+
+    for cid in diff.added_components:
+        if cid in circuit.components and cid not in diff.removed_components:
+            raise ValueError(f"Component {cid} already exists in circuit")
+
+    moved_out: Dict[str, Set[str]] = {}
+    moved_in: Set[str] = set()
+    seen_pins = set()
+    for move in diff.pin_moves:
+        if move.pin_id in seen_pins:
+            raise ValueError(f"Pin {move.pin_id} is moved more than once")
+        seen_pins.add(move.pin_id)
+
+        if move.old_net is not None:
+            old_net = circuit.nets.get(move.old_net)
+            if old_net is None or move.pin_id not in old_net.pins:
+                raise ValueError(f"Pin {move.pin_id} is not on net {move.old_net}")
+            moved_out.setdefault(move.old_net, set()).add(move.pin_id)
+
+        if move.new_net is not None:
+            moved_in.add(move.new_net)
+
+    # Pins that disappear with a removed or changed component must be moved off their nets
+    for cid in diff.removed_components:
+        for pin in circuit.components[cid].pins.values():
+            if pin.net is not None and pin.id not in seen_pins:
+                raise ValueError(f"Pin {pin.id} of removed component {cid} is still on net {pin.net}")
+
+    for cid, comp in diff.changed_components.items():
+        for name, pin in circuit.components[cid].pins.items():
+            if name not in comp.pins and pin.net is not None and pin.id not in seen_pins:
+                raise ValueError(f"Pin {pin.id} dropped from component {cid} is still on net {pin.net}")
+
+    for net_id in diff.added_nets:
+        if net_id in circuit.nets:
+            raise ValueError(f"Net {net_id} already exists in circuit")
+
+    for net_id in diff.removed_nets:
+        net = circuit.nets.get(net_id)
+        if net is None:
+            raise KeyError(f"Net {net_id} not found in circuit")
+        remaining = [p for p in net.pins if p not in moved_out.get(net_id, set())]
+        if remaining or net_id in moved_in:
+            raise ValueError(f"Net {net_id} still has pins and cannot be removed")
+
+
+def apply_diff(circuit: Circuit, diff: CircuitDiff) -> Circuit:
+    """Apply a CircuitDiff to circuit in place and return it.
+
+    Only the components, nets and pins named in the diff are visited. The
+    circuit is left untouched if the diff does not apply cleanly.
+    """
+    _check_diff(circuit, diff)
+
+    for cid in diff.removed_components:
+        del circuit.components[cid]
+
+    for cid, comp in diff.changed_components.items():
+        circuit.components[cid] = copy.deepcopy(comp)
+
+    for cid, comp in diff.added_components.items():
+        circuit.components[cid] = copy.deepcopy(comp)
+
+    for net_id in diff.added_nets:
+        circuit.nets[net_id] = Net(id=net_id)
+
+    for move in diff.pin_moves:
+        if move.old_net is not None:
+            circuit.nets[move.old_net].pins.remove(move.pin_id)
+
+        if move.new_net is not None:
+            if move.new_net not in circuit.nets:
+                circuit.nets[move.new_net] = Net(id=move.new_net)
+            if move.pin_id not in circuit.nets[move.new_net].pins:
+                circuit.nets[move.new_net].pins.append(move.pin_id)
+
+        # keep pin.net in sync when the pin still exists
+        if "." in move.pin_id:
+            comp_id, pin_name = move.pin_id.split(".", 1)
+            comp = circuit.components.get(comp_id)
+            if comp and pin_name in comp.pins:
+                comp.pins[pin_name].net = move.new_net
+
+    for net_id in diff.removed_nets:
+        del circuit.nets[net_id]
+
+    return circuit
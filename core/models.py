@@ -14,6 +14,17 @@ class Pin:
     def to_dict(self):
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            parent=data["parent"],
+            direction=data["direction"],
+            role=data.get("role"),
+            net=data.get("net"),
+        )
+
 
 @dataclass
 class Component:
@@ -30,6 +41,15 @@ class Component:
             "pins": {k: v.to_dict() for k, v in self.pins.items()},
         }
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=data["id"],
+            type=data.get("type"),
+            value=data.get("value"),
+            pins={str(k): Pin.from_dict(v) for k, v in data.get("pins", {}).items()},
+        )
+
 
 @dataclass
 class Net:
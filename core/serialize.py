@@ -1,5 +1,16 @@
 import json
 from dataclasses import asdict
 
+from core.diff import CircuitDiff
+
+
 def circuit_to_json(circuit):
     return json.dumps(asdict(circuit), indent=2)
+
+
+def diff_to_json(diff):
+    return json.dumps(diff.to_dict(), indent=2)
+
+
+def diff_from_json(text):
+    return CircuitDiff.from_dict(json.loads(text))
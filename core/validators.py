@@ -1,37 +1,27 @@
-from core.models import Circuit
+from core.models import Circuit, Component, Net
+from core.diff import CircuitDiff
 
 
-def validate_circuit(circuit: Circuit):
-    # Check for duplicate pin IDs and floating pins
-    seen_pins = set()
-    for comp in circuit.components.values():
-        for pin in comp.pins.values():
-            if pin.id in seen_pins:
-                raise ValueError(f"Duplicate pin id: {pin.id}")
-            seen_pins.add(pin.id)
-            if pin.net is None:
-                raise ValueError(f"Floating pin: {pin.id}")
+def _validate_component_pins(comp: Component):
+    for pin in comp.pins.values():
+        if pin.net is None:
+            raise ValueError(f"Floating pin: {pin.id}")
 
-    # Every net must connect >= 2 pins and reference existing pins
-    for net in circuit.nets.values():
-        if len(net.pins) < 2:
-            raise ValueError(f"Net {net.id} has less than 2 pins")
-        for pin_id in net.pins:
-            if "." not in pin_id:
-                raise ValueError(f"Invalid pin reference in net {net.id}: {pin_id}")
-            comp_id, pin_name = pin_id.split(".", 1)
-            if comp_id not in circuit.components:
-                raise ValueError(f"Net {net.id} references unknown component {comp_id}")
-            if pin_name not in circuit.components[comp_id].pins:
-                raise ValueError(f"Net {net.id} references unknown pin {pin_name} on {comp_id}")
 
+def _validate_net(circuit: Circuit, net: Net):
+    if len(net.pins) < 2:
+        raise ValueError(f"Net {net.id} has less than 2 pins")
+    for pin_id in net.pins:
+        if "." not in pin_id:
+            raise ValueError(f"Invalid pin reference in net {net.id}: {pin_id}")
+        comp_id, pin_name = pin_id.split(".", 1)
+        if comp_id not in circuit.components:
+            raise ValueError(f"Net {net.id} references unknown component {comp_id}")
+        if pin_name not in circuit.components[comp_id].pins:
+            raise ValueError(f"Net {net.id} references unknown pin {pin_name} on {comp_id}")
 
-def validate_electrical_reference(circuit: Circuit):
-    """Enforce Phase-2 electrical reference rules:
 
-    - Exactly one reference net named 'GND' must exist.
-    - At least one pin with role=='ground' must be connected to 'GND'.
-    """
+def _validate_gnd_net(circuit: Circuit):
     # Check for a single GND net
     gnd_net = circuit.nets.get("GND")
     if gnd_net is None:
@@ -54,10 +44,68 @@ def validate_electrical_reference(circuit: Circuit):
     if not found:
         raise ValueError("Electrical rule: no pin with role=ground connected to 'GND'")
 
+
+def _validate_ground_pins(comp: Component):
     # No pin with role=ground may be connected to any other net
+    for pin in comp.pins.values():
+        if pin.role == "ground":
+            if pin.net != "GND":
+                raise ValueError(f"Electrical rule: pin {pin.id} has role=ground but is connected to non-GND net '{pin.net}'")
+
+
+def validate_circuit(circuit: Circuit):
+    # Check for duplicate pin IDs and floating pins
+    seen_pins = set()
     for comp in circuit.components.values():
         for pin in comp.pins.values():
-            if pin.role == "ground":
-                if pin.net != "GND":
-                    raise ValueError(f"Electrical rule: pin {pin.id} has role=ground but is connected to non-GND net '{pin.net}'")
+            if pin.id in seen_pins:
+                raise ValueError(f"Duplicate pin id: {pin.id}")
+            seen_pins.add(pin.id)
+        _validate_component_pins(comp)
+
+    # Every net must connect >= 2 pins and reference existing pins
+    for net in circuit.nets.values():
+        _validate_net(circuit, net)
+
+
+def validate_electrical_reference(circuit: Circuit):
+    """Enforce Phase-2 electrical reference rules:
+
+    - Exactly one reference net named 'GND' must exist.
+    - At least one pin with role=='ground' must be connected to 'GND'.
+    """
+    _validate_gnd_net(circuit)
+
+    for comp in circuit.components.values():
+        _validate_ground_pins(comp)
+
+
+def validate_circuit_delta(circuit: Circuit, diff: CircuitDiff):
+    """Re-run Phase-1 and Phase-2 checks on a patched circuit, limited to what diff touched.
+
+    Assumes the circuit was valid before apply_diff(circuit, diff).
+    """
+    touched_nets = diff.touched_nets()
+
+    # GND rules only need re-checking where GND or a touched component is involved.
+    # A changed component that lost role=ground either still has its pin on GND
+    # (caught below) or moved it off GND (GND is then a touched net).
+    recheck_gnd = "GND" in touched_nets or "GND" in diff.removed_nets
+
+    for comp_id in diff.touched_components():
+        comp = circuit.components.get(comp_id)
+        if comp is None:
+            continue
+        _validate_component_pins(comp)
+        _validate_ground_pins(comp)
+        if any(pin.net == "GND" or pin.role == "ground" for pin in comp.pins.values()):
+            recheck_gnd = True
+
+    for net_id in touched_nets:
+        net = circuit.nets.get(net_id)
+        if net is None:
+            continue
+        _validate_net(circuit, net)
 
+    if recheck_gnd:
+        _validate_gnd_net(circuit)
@@ -0,0 +1,41 @@
+"""Script to compile two YAML netlists and print the structural diff as JSON."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.netlist_compiler import compile_netlist
+from core.diff import diff_circuits
+from core.serialize import diff_to_json
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 scripts/diff_netlist.py <old_netlist.yaml> <new_netlist.yaml>")
+        sys.exit(1)
+
+    old_path, new_path = sys.argv[1], sys.argv[2]
+
+    # Explicit component library map (no filesystem guessing)
+    component_library = {
+        "resistor": "components/resistors/resistor-class.yaml",
+        "terminal": "components/terminal/terminal-class.yaml",
+        "opamp": "components/opamp/opamp-class.yaml",
+        "capacitor": "components/capacitor/capacitor-class.yaml",
+        "ground": "components/ground/ground-class.yaml",
+    }
+
+    try:
+        old = compile_netlist(old_path, component_library)
+        new = compile_netlist(new_path, component_library)
+    except Exception as e:
+        print("Compile failed:", e)
+        sys.exit(2)
+
+    print(diff_to_json(diff_circuits(old, new)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.diff import CircuitDiff, PinMove, diff_circuits, apply_diff
+from core.loaders import load_component
+from core.models import Component
+from core.netlist_compiler import compile_netlist
+from core.serialize import diff_to_json, diff_from_json
+from core.validators import validate_circuit_delta
+
+COMPONENT_LIBRARY = {
+    "resistor": os.path.join(ROOT, "components/resistors/resistor-class.yaml"),
+    "terminal": os.path.join(ROOT, "components/terminal/terminal-class.yaml"),
+    "opamp": os.path.join(ROOT, "components/opamp/opamp-class.yaml"),
+    "capacitor": os.path.join(ROOT, "components/capacitor/capacitor-class.yaml"),
+    "ground": os.path.join(ROOT, "components/ground/ground-class.yaml"),
+}
+
+
+def compile_rc_opamp():
+    return compile_netlist(
+        os.path.join(ROOT, "netlists/rc_coupled_opamp.yaml"),
+        COMPONENT_LIBRARY,
+        schema_path=os.path.join(ROOT, "schemas/netlist.schema.json"),
+    )
+
+
+def test_delta_validation_catches_lost_ground_role():
+    old = compile_rc_opamp()
+    new = compile_rc_opamp()
+    gnd_term = load_component(COMPONENT_LIBRARY["terminal"], "GND_term")
+    gnd_term.pins["1"].net = "GND"
+    new.components["GND_term"] = gnd_term
+
+    diff = diff_circuits(old, new)
+    assert set(diff.changed_components) == {"GND_term"}
+    assert diff.pin_moves == []
+
+    apply_diff(old, diff)
+    with pytest.raises(ValueError, match="no pin with role=ground"):
+        validate_circuit_delta(old, diff)
+
+
+def test_apply_diff_leaves_circuit_untouched_on_bad_move():
+    circuit = compile_rc_opamp()
+    before = circuit.to_dict()
+    diff = CircuitDiff(
+        removed_components=["Vout"],
+        pin_moves=[PinMove(pin_id="Vout.1", old_net="WRONG", new_net=None)],
+    )
+
+    with pytest.raises(ValueError, match="not on net WRONG"):
+        apply_diff(circuit, diff)
+    assert circuit.to_dict() == before
+
+
+def test_apply_diff_rejects_removing_net_with_pins():
+    circuit = compile_rc_opamp()
+    before = circuit.to_dict()
+
+    with pytest.raises(ValueError, match="Net VCC still has pins"):
+        apply_diff(circuit, CircuitDiff(removed_nets=["VCC"]))
+    assert circuit.to_dict() == before
+
+
+def test_apply_diff_reproduces_new_circuit():
+    old = compile_rc_opamp()
+    new = compile_rc_opamp()
+    new.components["Rf"].value = "470k"
+    del new.components["Rbias1"]
+    new.nets["N_out"].pins.remove("Rbias1.1")
+    new.nets["N_bias"].pins.remove("Rbias1.2")
+    new.nets["N_bias"].pins.append("Vout.1")
+    new.nets["N_out"].pins.remove("Vout.1")
+    new.components["Vout"].pins["1"].net = "N_bias"
+
+    diff = diff_circuits(old, new)
+    apply_diff(old, diff)
+    validate_circuit_delta(old, diff)
+
+    assert old.components == new.components
+    assert {k: sorted(v.pins) for k, v in old.nets.items()} == {k: sorted(v.pins) for k, v in new.nets.items()}
+
+
+def test_diff_round_trips_through_json():
+    old = compile_rc_opamp()
+    new = compile_rc_opamp()
+    new.components["Rf"].value = "470k"
+    del new.components["Vin"]
+    new.nets["N_in"].pins.remove("Vin.1")
+    new.components["Vin2"] = load_component(COMPONENT_LIBRARY["terminal"], "Vin2")
+    new.components["Vin2"].pins["1"].net = "N_in"
+    new.nets["N_in"].pins.append("Vin2.1")
+
+    diff = diff_circuits(old, new)
+    assert CircuitDiff.from_dict(diff.to_dict()) == diff
+
+    restored = diff_from_json(diff_to_json(diff))
+    assert restored == diff
+    apply_diff(old, restored)
+    validate_circuit_delta(old, restored)
+    assert old.components == new.components
+
+
+def test_apply_diff_rejects_removed_component_left_on_net():
+    circuit = compile_rc_opamp()
+    before = circuit.to_dict()
+
+    with pytest.raises(ValueError, match="Pin Vout.1 of removed component Vout is still on net N_out"):
+        apply_diff(circuit, CircuitDiff(removed_components=["Vout"]))
+    assert circuit.to_dict() == before
+
+
+def test_apply_diff_rejects_dropped_pin_left_on_net():
+    circuit = compile_rc_opamp()
+    before = circuit.to_dict()
+    pinless = Component(id="Vin", type="terminal", value=None)
+
+    with pytest.raises(ValueError, match="Pin Vin.1 dropped from component Vin is still on net N_in"):
+        apply_diff(circuit, CircuitDiff(changed_components={"Vin": pinless}))
+    assert circuit.to_dict() == before
+
+
+def test_apply_diff_rejects_stale_net_ids():
+    circuit = compile_rc_opamp()
+    before = circuit.to_dict()
+
+    with pytest.raises(ValueError, match="Net VCC already exists"):
+        apply_diff(circuit, CircuitDiff(added_nets=["VCC"]))
+    with pytest.raises(KeyError, match="Net N_gone not found"):
+        apply_diff(circuit, CircuitDiff(removed_nets=["N_gone"]))
+    assert circuit.to_dict() == before
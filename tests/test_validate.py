@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VALIDATE = os.path.join(ROOT, "validate.py")
+
+SCHEMA = {"type": "object", "required": ["name"]}
+
+
+@pytest.fixture
+def library(tmp_path):
+    components = tmp_path / "components"
+    components.mkdir()
+    for i in range(6):
+        (components / f"r{i}.yaml").write_text(f"name: r{i}\n")
+    (components / "bad.yaml").write_text("type: resistor\n")
+    (components / "empty.yaml").write_text("")
+    (components / "null.yaml").write_text("~\n")
+    (components / "broken.yaml").write_text("a: [\n")
+
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps(SCHEMA))
+    return tmp_path
+
+
+def run_validate(library, *extra):
+    cmd = [
+        sys.executable, VALIDATE,
+        "--schema", str(library / "schema.json"),
+        "--components", str(library / "components"),
+        "--cache", str(library / "cache.json"),
+        *extra,
+    ]
+    return subprocess.run(cmd, capture_output=True, text=True)
+
+
+def run_json(library, *extra):
+    proc = run_validate(library, "--json", *extra)
+    return proc.returncode, json.loads(proc.stdout)
+
+
+def test_json_summary_and_exit_codes(library):
+    code, report = run_json(library)
+    assert code == 1
+    assert report["success"] is False
+    assert report["checked"] == 10
+    errors = {os.path.basename(e["file"]): e["error"] for e in report["errors"]}
+    assert set(errors) == {"bad.yaml", "empty.yaml", "null.yaml", "broken.yaml"}
+    assert errors["empty.yaml"] == "EMPTY_FILE"
+    assert errors["null.yaml"] == "PARSE_EMPTY_OR_NULL"
+    assert errors["bad.yaml"].startswith("ValidationError:")
+    assert errors["broken.yaml"].startswith("YAML_ERROR:")
+
+    for name in ("bad.yaml", "empty.yaml", "null.yaml", "broken.yaml"):
+        (library / "components" / name).unlink()
+    code, report = run_json(library)
+    assert code == 0
+    assert report == {"success": True, "checked": 6, "cached": 6, "errors": []}
+
+
+def test_second_run_is_fully_cached(library):
+    _, first = run_json(library)
+    assert first["cached"] == 0
+
+    _, second = run_json(library)
+    assert second["cached"] == second["checked"] == 10
+    assert second["errors"] == first["errors"]
+
+
+def test_editing_a_file_invalidates_only_that_entry(library):
+    run_json(library)
+    (library / "components" / "bad.yaml").write_text("name: fixed\n")
+
+    _, report = run_json(library)
+    assert report["cached"] == report["checked"] - 1
+    assert not any(e["file"].endswith("bad.yaml") for e in report["errors"])
+
+
+def test_schema_change_invalidates_all_entries(library):
+    run_json(library)
+    (library / "schema.json").write_text(json.dumps({"type": "object", "required": ["type"]}))
+
+    _, report = run_json(library)
+    assert report["cached"] == 0
+    assert any(e["file"].endswith("r0.yaml") for e in report["errors"])
+
+
+def test_jobs_match_serial_results(library):
+    _, serial = run_json(library, "--no-cache", "--jobs", "1")
+    _, parallel = run_json(library, "--no-cache", "--jobs", "2")
+    assert parallel == serial
+    assert not (library / "cache.json").exists()
+
+
+def test_fatal_errors_are_json(library):
+    code, report = run_json(library, "--jobs", "0")
+    assert code == 1
+    assert report["success"] is False
+    assert "--jobs" in report["fatal"]
+
+    proc = run_validate(library, "--json", "--schema", str(library / "missing.json"))
+    assert proc.returncode == 1
+    assert json.loads(proc.stdout)["fatal"].startswith("Schema not found")
+
+
+def test_text_output(library):
+    proc = run_validate(library)
+    assert proc.returncode == 1
+    assert "null.yaml: Parsed to None / empty structure" in proc.stdout
+    assert "Validation FAILED: 4 errors found." in proc.stdout
@@ -4,7 +4,7 @@ validate.py
 Repository-wide YAML -> JSON Schema validator.
 
 Usage:
-    python validate.py
+    python validate.py [--jobs N] [--cache PATH | --no-cache] [--json]
 
 Exits with 0 on success, 1 on failure.
 
@@ -17,12 +17,19 @@ Behavior:
     - Walks /components recursively, finds .yml/.yaml files
     - Attempts to parse each YAML file. Malformed/empty files are handled and reported as errors.
     - Validates parsed data against the master schema and reports any jsonschema errors.
+    - Results are cached by file content hash + schema hash + checker and library versions
+      (default .validate_cache.json), so unchanged files are not re-parsed or re-validated.
+    - With --jobs N > 1, uncached files are parsed and validated in a process pool.
+    - With --json, prints a single JSON summary (checked, cached, errors per file) instead of text.
 """
 
 import os
 import sys
 import json
+import hashlib
 import argparse
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor
 from jsonschema import validate as js_validate, exceptions as js_exceptions
 
 # Try to import yaml but fail gracefully with an informative error
@@ -33,16 +40,23 @@ except Exception as e:
     raise
 
 
-def load_master_schema(schema_path):
+def fail(message, as_json=False):
+    # Fatal setup errors; in --json mode stdout must stay machine-readable
+    if as_json:
+        print(json.dumps({'success': False, 'fatal': message}, indent=2))
+    else:
+        print(message)
+    sys.exit(1)
+
+
+def load_master_schema(schema_path, as_json=False):
     if not os.path.exists(schema_path):
-        print(f"Schema not found at {schema_path}")
-        sys.exit(1)
+        fail(f"Schema not found at {schema_path}", as_json)
     try:
         with open(schema_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
-        print(f"Failed to read/parse master schema: {e}")
-        sys.exit(1)
+        fail(f"Failed to read/parse master schema: {e}", as_json)
 
 
 def find_yaml_files(root_dir):
@@ -52,66 +66,169 @@ def find_yaml_files(root_dir):
                 yield os.path.join(dirpath, fname)
 
 
-def safe_load_yaml(path):
+def parse_yaml_text(content):
+    if not content.strip():
+        # Empty file
+        return None, 'EMPTY_FILE'
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if not content.strip():
-                # Empty file
-                return None, 'EMPTY_FILE'
-            data = yaml.safe_load(content)
-            return data, None
+        return yaml.safe_load(content), None
     except yaml.YAMLError as ye:
         return None, f'YAML_ERROR: {ye}'
+
+
+def check_content(content, schema):
+    """Parse and validate one file's text. Returns an error string, or None if valid."""
+    data, err = parse_yaml_text(content)
+    if err is not None:
+        return err
+
+    if data is None:
+        return 'PARSE_EMPTY_OR_NULL'
+
+    # Validate using jsonschema
+    try:
+        js_validate(instance=data, schema=schema)
+    except js_exceptions.ValidationError as ve:
+        # Provide useful context
+        err_msg = f"ValidationError: {ve.message}"
+        # include path if possible
+        if ve.absolute_path:
+            err_msg += f" at path: {'/'.join(map(str, ve.absolute_path))}"
+        return err_msg
+    except js_exceptions.SchemaError as se:
+        return f"SCHEMA_ERROR: {se}"
     except Exception as e:
-        return None, f'IO_ERROR: {e}'
+        return f"UNKNOWN_VALIDATION_ERROR: {e}"
+    return None
+
+
+# Schema handed to pool workers once via the initializer instead of with every task
+_worker_schema = None
+
+
+def _init_worker(schema):
+    global _worker_schema
+    _worker_schema = schema
+
+
+def _check_content_in_worker(content):
+    return check_content(content, _worker_schema)
+
+
+# Bump whenever check_content or its error strings change, so stale cached results are dropped
+CACHE_VERSION = 1
+
+
+def schema_hash(schema):
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def cache_salt(schema):
+    """Everything besides file bytes that can change a result: checker, library versions and schema."""
+    parts = [str(CACHE_VERSION), metadata.version('jsonschema'), metadata.version('pyyaml'), schema_hash(schema)]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def load_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except Exception:
+        # A corrupt cache only costs a full run
+        return {}
+
+
+def save_cache(cache_path, cache):
+    if not cache_path:
+        return
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, sort_keys=True)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Warning: failed to write validation cache {cache_path}: {e}", file=sys.stderr)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Repository-wide component YAML -> JSONSchema validator')
     parser.add_argument('--schema', default='schemas/component_schema.json', help='Path to master component schema')
     parser.add_argument('--components', default='components', help='Path to components directory')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes for parsing/validation')
+    parser.add_argument('--cache', default='.validate_cache.json', help='Path to the persistent result cache')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the result cache')
+    parser.add_argument('--json', action='store_true', help='Print the summary and per-file errors as JSON')
     args = parser.parse_args()
+    if args.jobs < 1:
+        fail(f"--jobs must be at least 1, got {args.jobs}", args.json)
 
-    schema = load_master_schema(args.schema)
-
-    checked = 0
-    errors = []
+    schema = load_master_schema(args.schema, args.json)
+    cache_path = None if args.no_cache else args.cache
 
     if not os.path.isdir(args.components):
-        print(f"Components directory not found: {args.components}")
-        sys.exit(1)
-
-    for yaml_path in find_yaml_files(args.components):
-        checked += 1
-        data, err = safe_load_yaml(yaml_path)
-        if err is not None:
-            errors.append((yaml_path, err))
-            print(f"{yaml_path}: {err}")
-            continue
+        fail(f"Components directory not found: {args.components}", args.json)
 
-        if data is None:
-            errors.append((yaml_path, 'PARSE_EMPTY_OR_NULL'))
-            print(f"{yaml_path}: Parsed to None / empty structure")
-            continue
+    cache = load_cache(cache_path)
+    salt = cache_salt(schema)
 
-        # Validate using jsonschema
+    results = {}
+    pending = []
+    keys = {}
+    yaml_paths = list(find_yaml_files(args.components))
+    for yaml_path in yaml_paths:
         try:
-            js_validate(instance=data, schema=schema)
-        except js_exceptions.ValidationError as ve:
-            # Provide useful context
-            err_msg = f"ValidationError: {ve.message}"
-            # include path if possible
-            if ve.absolute_path:
-                err_msg += f" at path: {'/'.join(map(str, ve.absolute_path))}"
-            errors.append((yaml_path, err_msg))
-            print(f"{yaml_path}: {err_msg}")
-        except js_exceptions.SchemaError as se:
-            errors.append((yaml_path, f"SCHEMA_ERROR: {se}"))
-            print(f"{yaml_path}: SCHEMA_ERROR: {se}")
+            with open(yaml_path, 'rb') as f:
+                raw = f.read()
+            content = raw.decode('utf-8')
         except Exception as e:
-            errors.append((yaml_path, f"UNKNOWN_VALIDATION_ERROR: {e}"))
-            print(f"{yaml_path}: UNKNOWN_VALIDATION_ERROR: {e}")
+            results[yaml_path] = f'IO_ERROR: {e}'
+            continue
+
+        key = hashlib.sha256(salt.encode('utf-8') + raw).hexdigest()
+        keys[yaml_path] = key
+        if key in cache:
+            results[yaml_path] = cache[key]
+        else:
+            pending.append((yaml_path, content))
+
+    cached = len(keys) - len(pending)
+
+    contents = [content for _, content in pending]
+    if args.jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(schema,)) as pool:
+            outcomes = list(pool.map(_check_content_in_worker, contents, chunksize=max(1, len(contents) // (args.jobs * 4))))
+    else:
+        outcomes = [check_content(content, schema) for content in contents]
+
+    for (yaml_path, _), err in zip(pending, outcomes):
+        results[yaml_path] = err
+        cache[keys[yaml_path]] = err
+
+    if cache_path is not None and pending:
+        # Drop entries for files that no longer exist or have changed
+        live = set(keys.values())
+        save_cache(cache_path, {k: v for k, v in cache.items() if k in live})
+
+    checked = len(yaml_paths)
+    errors = [(path, results[path]) for path in yaml_paths if results[path] is not None]
+
+    if args.json:
+        print(json.dumps({
+            'success': not errors,
+            'checked': checked,
+            'cached': cached,
+            'errors': [{'file': path, 'error': err} for path, err in errors],
+        }, indent=2))
+        sys.exit(0 if not errors else 1)
+
+    for yaml_path, err in errors:
+        if err == 'PARSE_EMPTY_OR_NULL':
+            print(f"{yaml_path}: Parsed to None / empty structure")
+        else:
+            print(f"{yaml_path}: {err}")
 
     if not errors:
         print(f"✅ Validation SUCCESS: {checked} component files checked.")